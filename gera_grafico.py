@@ -29,6 +29,10 @@ def gerar_grafico_barras_csv(caminho_csv: str, coluna_x: str, coluna_y: str):
     if coluna_y not in df.columns:
         print(f"Erro: Coluna '{coluna_y}' não encontrada no arquivo CSV. Colunas disponíveis: {df.columns.tolist()}")
         return
+
+    # Linhas medidas com profiling ativo têm durações distorcidas pela instrumentação
+    if 'Profiling' in df.columns:
+        df = df[df['Profiling'].isna()]
     
     # Configuração básica do estilo do Seaborn
     sns.set_theme(style="whitegrid")
@@ -20,8 +20,11 @@ def gerar_tabela_csv(caminho_csv: str, title: str = "Tabela de Dados"):
         print(f"Erro ao ler o arquivo CSV: {e}")
         return
 
+    # Linhas sem métricas de profiling ficam em branco em vez de "nan"
+    df = df.fillna('')
+
     # Criar uma figura e um eixo para a tabela
-    fig, ax = plt.subplots(figsize=(10, len(df.index) * 0.6 + 1)) # Tamanho ajustado dinamicamente
+    fig, ax = plt.subplots(figsize=(max(10, len(df.columns) * 1.8), len(df.index) * 0.6 + 1)) # Tamanho ajustado dinamicamente
     
     # Esconder os eixos X e Y
     ax.axis('off')
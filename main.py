@@ -3,6 +3,7 @@ import mysql.connector
 from mysql.connector import Error
 
 import src.crud as crud
+import src.profiling as profiling
 import src.utils as utils
 
 # --- Configurações do seu banco de dados ---
@@ -15,6 +16,21 @@ db_config = {
 database_name = "benchmark_db"
 table_name = "steam_games"
 
+# --- Instrumentação de recursos por operação (opcional) ---
+# 'habilitado': mede pico de RSS da operação, pico do tracemalloc, CPU user/sys e coletas do GC,
+#               gravando as métricas junto com o tempo em results.csv; as métricas por etapa
+#               (_prepare_dataframe, montagem das tuplas, construção do DataFrame...) vão para results_etapas.csv.
+#               O tracemalloc deixa mais lentas principalmente as etapas com muitos objetos Python,
+#               por isso a duração das etapas é gravada como "Duração com tracemalloc (s)".
+# 'diretorio_flame': se definido com 'habilitado' False, grava um flame graph (formato collapsed)
+#               por operação nesse diretório. A thread de amostragem disputa o GIL com a operação,
+#               então as durações dessas linhas também ficam distorcidas.
+# Linhas instrumentadas são marcadas na coluna "Profiling" de results.csv e ignoradas por gera_grafico.py.
+profiling_config = {
+    'habilitado': False,
+    'diretorio_flame': None, # Ex: "flamegraphs"
+}
+
 # --- Definição SQL para criar a tabela ---
 create_table_query = f"""
 CREATE TABLE IF NOT EXISTS {table_name} (
@@ -114,11 +130,12 @@ if __name__ == "__main__":
                 temp_cursor.fetchall() # Consumir resultado do TRUNCATE
                 connection.commit()
             
-            start_time_simple = time.time()
-            rows_affected_simple = crud.simple_insertion(table_name, connection, 0)
-            end_time_simple = time.time()
+            with profiling.PerfilRecursos("Inserção simples", **profiling_config) as perfil_simple:
+                start_time_simple = time.time()
+                rows_affected_simple = crud.simple_insertion(table_name, connection, 0)
+                end_time_simple = time.time()
             duration_simple = end_time_simple - start_time_simple
-            utils.log_results("Inserção simples", rows_affected_simple, duration_simple)
+            utils.log_results("Inserção simples", rows_affected_simple, duration_simple, metricas=perfil_simple.metricas, etapas=perfil_simple.etapas)
             
             # print("\n--- Iniciando Teste de Inserção em Massa (todas as linhas) ---")
             with connection.cursor() as temp_cursor:
@@ -126,47 +143,52 @@ if __name__ == "__main__":
                 temp_cursor.fetchall() # Consumir resultado do TRUNCATE
                 connection.commit()
             
-            start_time_mass = time.time()
-            rows_affected_mass = crud.mass_insertion(table_name, connection)
-            end_time_mass = time.time()
+            with profiling.PerfilRecursos("Inserção em massa", **profiling_config) as perfil_mass:
+                start_time_mass = time.time()
+                rows_affected_mass = crud.mass_insertion(table_name, connection)
+                end_time_mass = time.time()
             duration_mass = end_time_mass - start_time_mass
-            utils.log_results("Inserção em massa", rows_affected_mass, duration_mass)
+            utils.log_results("Inserção em massa", rows_affected_mass, duration_mass, metricas=perfil_mass.metricas, etapas=perfil_mass.etapas)
             
             # --- Testes de Consulta ---
             # print("\n--- Iniciando Testes de Consulta ---")
             
-            start_time_query_simple = time.time()
-            df_simple_query = crud.simple_query(table_name, connection, limit=5)
-            end_time_query_simple = time.time()
+            with profiling.PerfilRecursos("Consulta simples", **profiling_config) as perfil_query_simple:
+                start_time_query_simple = time.time()
+                df_simple_query = crud.simple_query(table_name, connection, limit=5)
+                end_time_query_simple = time.time()
             duration_query_simple = end_time_query_simple - start_time_query_simple
             # print("Resultados da Consulta Simples:\n", df_simple_query)
-            utils.log_results("Consulta simples", len(df_simple_query), duration_query_simple)
+            utils.log_results("Consulta simples", len(df_simple_query), duration_query_simple, metricas=perfil_query_simple.metricas, etapas=perfil_query_simple.etapas)
 
-            start_time_query_complex = time.time()
-            df_complex_query = crud.complex_query(table_name, connection)
-            end_time_query_complex = time.time()
+            with profiling.PerfilRecursos("Consulta complexa", **profiling_config) as perfil_query_complex:
+                start_time_query_complex = time.time()
+                df_complex_query = crud.complex_query(table_name, connection)
+                end_time_query_complex = time.time()
             duration_query_complex = end_time_query_complex - start_time_query_complex
             # print("Resultados da Consulta Complexa:\n", df_complex_query)
-            utils.log_results("Consulta complexa", len(df_complex_query), duration_query_complex)
+            utils.log_results("Consulta complexa", len(df_complex_query), duration_query_complex, metricas=perfil_query_complex.metricas, etapas=perfil_query_complex.etapas)
 
             # --- Testes de Atualização ---
             # print("\n--- Iniciando Testes de Atualização ---")
             
             game_to_update_name = "Counter-Strike 2" # Verifique se este jogo existe no seu CSV/DB
             
-            start_time_update_price = time.time()
-            updated_rows_price = crud.simple_update(table_name, connection,
-                                                    game_to_update_name, "0.00")
-            end_time_update_price = time.time()
+            with profiling.PerfilRecursos("Atualização simples", **profiling_config) as perfil_update_price:
+                start_time_update_price = time.time()
+                updated_rows_price = crud.simple_update(table_name, connection,
+                                                        game_to_update_name, "0.00")
+                end_time_update_price = time.time()
             duration_update_price = end_time_update_price - start_time_update_price
-            utils.log_results("Atualização simples", updated_rows_price, duration_update_price)
+            utils.log_results("Atualização simples", updated_rows_price, duration_update_price, metricas=perfil_update_price.metricas, etapas=perfil_update_price.etapas)
 
             new_dev_name = "Valve Software (New)"
-            start_time_update_dev = time.time()
-            updated_rows_dev = crud.mass_update(table_name, connection, new_dev_name)
-            end_time_update_dev = time.time()
+            with profiling.PerfilRecursos("Atualização em massa", **profiling_config) as perfil_update_dev:
+                start_time_update_dev = time.time()
+                updated_rows_dev = crud.mass_update(table_name, connection, new_dev_name)
+                end_time_update_dev = time.time()
             duration_update_dev = end_time_update_dev - start_time_update_dev
-            utils.log_results("Atualização em massa", updated_rows_dev, duration_update_dev)
+            utils.log_results("Atualização em massa", updated_rows_dev, duration_update_dev, metricas=perfil_update_dev.metricas, etapas=perfil_update_dev.etapas)
 
             # --- Testes de Deleção ---
             # print("\n--- Iniciando Testes de Deleção ---")
@@ -174,17 +196,19 @@ if __name__ == "__main__":
             game_to_delete_name = "Dota 2" # Verifique se este jogo existe no seu DB
             year_to_delete = "2004" # Exemplo: ano de lançamento para deleção em massa
 
-            start_time_delete_name = time.time()
-            deleted_rows_name = crud.simple_delete(table_name, connection, game_to_delete_name)
-            end_time_delete_name = time.time()
+            with profiling.PerfilRecursos("Deleção simples", **profiling_config) as perfil_delete_name:
+                start_time_delete_name = time.time()
+                deleted_rows_name = crud.simple_delete(table_name, connection, game_to_delete_name)
+                end_time_delete_name = time.time()
             duration_delete_name = end_time_delete_name - start_time_delete_name
-            utils.log_results("Deleção simples", deleted_rows_name, duration_delete_name)
+            utils.log_results("Deleção simples", deleted_rows_name, duration_delete_name, metricas=perfil_delete_name.metricas, etapas=perfil_delete_name.etapas)
 
-            start_time_delete_year = time.time()
-            deleted_rows_year = crud.mass_delete(table_name, connection, year_to_delete)
-            end_time_delete_year = time.time()
+            with profiling.PerfilRecursos("Deleção em massa", **profiling_config) as perfil_delete_year:
+                start_time_delete_year = time.time()
+                deleted_rows_year = crud.mass_delete(table_name, connection, year_to_delete)
+                end_time_delete_year = time.time()
             duration_delete_year = end_time_delete_year - start_time_delete_year
-            utils.log_results("Deleção em massa", deleted_rows_year, duration_delete_year)
+            utils.log_results("Deleção em massa", deleted_rows_year, duration_delete_year, metricas=perfil_delete_year.metricas, etapas=perfil_delete_year.etapas)
 
         except Exception as e:
             print(f"Um erro ocorreu durante as operações do banco de dados: {e}")
@@ -3,6 +3,8 @@ from mysql.connector.connection import MySQLConnection
 from mysql.connector import Error
 import pandas.api.types # Importar para usar pd.api.types.is_numeric_dtype
 
+from src.profiling import medir_etapa
+
 # --- Caminho do Arquivo CSV ---
 CSV_FILE_PATH = "data/steam_games_complete.csv"
 
@@ -35,8 +37,10 @@ def simple_insertion(table_name: str, connection: MySQLConnection, row_index: in
     cursor = None
     try:
         cursor = connection.cursor()
-        df = pd.read_csv(CSV_FILE_PATH, encoding='utf-8', sep=',')
-        df_prepared = _prepare_dataframe(df)
+        with medir_etapa("read_csv"):
+            df = pd.read_csv(CSV_FILE_PATH, encoding='utf-8', sep=',')
+        with medir_etapa("_prepare_dataframe"):
+            df_prepared = _prepare_dataframe(df)
         
         if row_index < 0 or row_index >= len(df_prepared):
             print(f"Erro: Índice de linha {row_index} fora do limite do DataFrame preparado (0 a {len(df_prepared) - 1}).")
@@ -46,9 +50,11 @@ def simple_insertion(table_name: str, connection: MySQLConnection, row_index: in
         columns_sql = ", ".join(single_row_df.columns.tolist())
         values_placeholders = ", ".join(["%s"] * len(single_row_df.columns.tolist()))
         insert_query = f"INSERT INTO {table_name} ({columns_sql}) VALUES ({values_placeholders});"
-        data_to_insert = tuple(single_row_df.values[0])
+        with medir_etapa("montagem das tuplas"):
+            data_to_insert = tuple(single_row_df.values[0])
 
-        cursor.execute(insert_query, data_to_insert)
+        with medir_etapa("execute"):
+            cursor.execute(insert_query, data_to_insert)
         connection.commit()
         cursor.fetchall() # Garante que qualquer resultado pendente seja consumido
         print(f"Linha {row_index} inserida com sucesso na tabela '{table_name}' e commit realizado.")
@@ -85,17 +91,21 @@ def mass_insertion(table_name: str, connection: MySQLConnection) -> int:
     cursor = None
     try:
         cursor = connection.cursor()
-        df = pd.read_csv(CSV_FILE_PATH, encoding='utf-8', sep=',')
-        df_prepared = _prepare_dataframe(df)
+        with medir_etapa("read_csv"):
+            df = pd.read_csv(CSV_FILE_PATH, encoding='utf-8', sep=',')
+        with medir_etapa("_prepare_dataframe"):
+            df_prepared = _prepare_dataframe(df)
         
         # print(f"\nPreparando para inserir {len(df_prepared)} linhas na tabela '{table_name}'...")
 
         columns_sql = ", ".join(df_prepared.columns.tolist())
         values_placeholders = ", ".join(["%s"] * len(df_prepared.columns.tolist()))
         insert_query = f"INSERT INTO {table_name} ({columns_sql}) VALUES ({values_placeholders});"
-        data_to_insert = [tuple(row) for row in df_prepared.values]
+        with medir_etapa("montagem das tuplas"):
+            data_to_insert = [tuple(row) for row in df_prepared.values]
 
-        cursor.executemany(insert_query, data_to_insert)
+        with medir_etapa("executemany"):
+            cursor.executemany(insert_query, data_to_insert)
         connection.commit()
         cursor.fetchall() # Garante que qualquer resultado pendente seja consumido
         print(f"Todas as {len(df_prepared)} linhas inseridas com sucesso na tabela '{table_name}' e commit realizado.")
@@ -136,13 +146,16 @@ def simple_query(table_name: str, connection: MySQLConnection, limit: int = 5) -
     try:
         cursor = connection.cursor()
         query = f"SELECT * FROM {table_name} LIMIT {limit}"
-        cursor.execute(query)
+        with medir_etapa("execute"):
+            cursor.execute(query)
         # REMOVIDO: connection.commit() - SELECTs não precisam de commit
         columns = [i[0] for i in cursor.description]
-        data = cursor.fetchall() # Aqui os resultados são lidos
+        with medir_etapa("fetchall"):
+            data = cursor.fetchall() # Aqui os resultados são lidos
 
         if data:
-            df = pd.DataFrame(data, columns=columns)
+            with medir_etapa("construção do DataFrame"):
+                df = pd.DataFrame(data, columns=columns)
             print(f"Consulta simples realizada com sucesso. Retornadas {len(df)} linhas.")
         else:
             print("Consulta simples: Nenhuma linha encontrada.")
@@ -201,13 +214,16 @@ def complex_query(table_name: str, connection: MySQLConnection, limit: int = 5)
         ORDER BY rg.genre, rg.rank_preco_por_genero
         LIMIT {limit};
         """
-        cursor.execute(query)
+        with medir_etapa("execute"):
+            cursor.execute(query)
         # REMOVIDO: connection.commit() - SELECTs não precisam de commit
         columns = [i[0] for i in cursor.description]
-        data = cursor.fetchall() # Aqui os resultados são lidos
+        with medir_etapa("fetchall"):
+            data = cursor.fetchall() # Aqui os resultados são lidos
 
         if data:
-            df = pd.DataFrame(data, columns=columns)
+            with medir_etapa("construção do DataFrame"):
+                df = pd.DataFrame(data, columns=columns)
             print(f"Consulta complexa realizada com sucesso. Retornadas {len(df)} linhas.")
         else:
             print("Consulta complexa: Nenhuma linha encontrada com os critérios especificados.")
@@ -0,0 +1,249 @@
+import gc
+import os
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+
+try:
+    import psutil # Mede o RSS em qualquer plataforma (inclusive Windows)
+except ImportError:
+    psutil = None
+
+# --- Perfil atualmente ativo (usado por medir_etapa dentro de src/crud.py) ---
+_perfil_ativo = None
+_aviso_rss_emitido = False
+_aviso_flame_emitido = False
+
+_ARQUIVO_STATM = "/proc/self/statm"
+_TAMANHO_PAGINA = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else None
+
+def _rss_atual_bytes(processo) -> int | None:
+    """
+    Retorna o RSS atual do processo em bytes, ou None se não houver como medir.
+    Usa psutil quando instalado e, na falta dele, /proc/self/statm (Linux).
+    """
+    if processo is not None:
+        return processo.memory_info().rss
+    if _TAMANHO_PAGINA and os.path.exists(_ARQUIVO_STATM):
+        with open(_ARQUIVO_STATM) as arquivo:
+            return int(arquivo.read().split()[1]) * _TAMANHO_PAGINA
+    return None
+
+def _total_coletas_gc() -> int:
+    """
+    Soma o número de coletas já feitas pelo coletor de lixo em todas as gerações.
+    """
+    return sum(estatistica['collections'] for estatistica in gc.get_stats())
+
+def _nome_arquivo(nome: str) -> str:
+    """
+    Converte o nome de uma operação em um nome de arquivo seguro.
+    """
+    return re.sub(r'[^\w-]+', '_', nome.strip().lower()).strip('_') or 'operacao'
+
+def _bytes_para_mb(valor: int) -> float:
+    return round(valor / (1024 * 1024), 2)
+
+class _Amostrador(threading.Thread):
+    """
+    Thread que, a cada intervalo, lê o RSS atual (guardando o máximo) e, se pedido,
+    captura a pilha da thread alvo. As pilhas são acumuladas como tuplas de code
+    objects e só viram texto em salvar(), depois que a medição terminou.
+    O arquivo gerado usa o formato "collapsed" (uma linha "f1;f2;f3 contagem" por pilha),
+    aceito por flamegraph.pl, speedscope e inferno.
+    """
+
+    def __init__(self, thread_id: int, intervalo_segundos: float, medir_rss: bool, coletar_pilhas: bool):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.intervalo_segundos = intervalo_segundos
+        self.coletar_pilhas = coletar_pilhas
+        self.processo = psutil.Process() if medir_rss and psutil is not None else None
+        self.medir_rss = medir_rss
+        self.rss_inicial = _rss_atual_bytes(self.processo) if medir_rss else None
+        self.pico_rss = self.rss_inicial
+        self.pilhas = Counter()
+        self._parar = threading.Event()
+
+    def _amostrar_rss(self):
+        rss = _rss_atual_bytes(self.processo)
+        if rss is not None and rss > self.pico_rss:
+            self.pico_rss = rss
+
+    def _amostrar_pilha(self):
+        frame = sys._current_frames().get(self.thread_id)
+        pilha = []
+        while frame is not None:
+            pilha.append(frame.f_code)
+            frame = frame.f_back
+        if pilha:
+            self.pilhas[tuple(pilha)] += 1
+
+    def run(self):
+        while not self._parar.wait(self.intervalo_segundos):
+            if self.rss_inicial is not None:
+                self._amostrar_rss()
+            if self.coletar_pilhas:
+                self._amostrar_pilha()
+
+    def parar(self):
+        self._parar.set()
+        self.join()
+        if self.rss_inicial is not None:
+            self._amostrar_rss() # Garante ao menos uma leitura em operações mais curtas que o intervalo
+
+    def salvar(self, caminho: str):
+        with open(caminho, 'w', encoding='utf-8') as arquivo:
+            for pilha, contagem in self.pilhas.most_common():
+                nomes = [f"{os.path.basename(codigo.co_filename)}:{codigo.co_name}" for codigo in reversed(pilha)]
+                arquivo.write(f"{';'.join(nomes)} {contagem}\n")
+
+class PerfilRecursos:
+    """
+    Context manager que mede o uso de recursos do cliente durante uma operação:
+    pico de RSS da operação, pico do tracemalloc, tempo de CPU (user/sys) e coletas do GC.
+    As etapas marcadas com medir_etapa ficam em 'etapas' (duração e pico do tracemalloc).
+
+    Quando 'habilitado' é False não mede nada e 'metricas'/'etapas' ficam vazios, de modo
+    que o resultado pode ser passado direto para utils.log_results. O flame graph
+    (formato collapsed) é gravado em 'diretorio_flame' apenas com 'habilitado' False,
+    para que a coleta das pilhas não entre nos picos do tracemalloc.
+    A coluna "Profiling" de 'metricas' indica que a duração da linha foi medida com
+    instrumentação ativa. Perfis podem ser aninhados: o pico do interno entra no externo.
+    """
+
+    def __init__(self, nome: str, habilitado: bool = True, diretorio_flame: str | None = None,
+                 intervalo_amostragem: float = 0.005):
+        self.nome = nome
+        self.habilitado = habilitado
+        self.diretorio_flame = diretorio_flame
+        self.intervalo_amostragem = intervalo_amostragem
+        self.metricas = {}
+        self.etapas = []
+        self._picos_etapas = [] # Pico acumulado de cada etapa aberta (etapas podem ser aninhadas)
+        self._amostrador = None
+        self._perfil_anterior = None
+        self._iniciou_tracemalloc = False
+
+    def __enter__(self):
+        global _perfil_ativo, _aviso_rss_emitido, _aviso_flame_emitido
+        # O flame graph acumula pilhas em memória Python; com o tracemalloc ativo isso entraria
+        # nos picos medidos, então as pilhas só são coletadas em execuções sem 'habilitado'.
+        coletar_pilhas = bool(self.diretorio_flame) and not self.habilitado
+        if self.diretorio_flame and self.habilitado and not _aviso_flame_emitido:
+            print("Aviso: flame graph ignorado com 'habilitado' True. Rode com 'habilitado' False para gravá-lo.")
+            _aviso_flame_emitido = True
+
+        if self.habilitado or coletar_pilhas:
+            self._amostrador = _Amostrador(threading.get_ident(), self.intervalo_amostragem,
+                                           medir_rss=self.habilitado, coletar_pilhas=coletar_pilhas)
+            if self.habilitado and self._amostrador.rss_inicial is None and not _aviso_rss_emitido:
+                print("Aviso: não foi possível medir o RSS nesta plataforma. Instale o psutil (pip install psutil) para registrar o pico de RSS.")
+                _aviso_rss_emitido = True
+
+        if self.habilitado:
+            self._perfil_anterior = _perfil_ativo
+            if self._perfil_anterior is not None:
+                # Preserva o pico do perfil externo antes de reiniciar o contador do tracemalloc
+                self._perfil_anterior._atualizar_pico_tracemalloc()
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._iniciou_tracemalloc = True
+            tracemalloc.reset_peak()
+            self._memoria_inicial = tracemalloc.get_traced_memory()[0]
+            self._pico_tracemalloc = self._memoria_inicial
+            self._coletas_gc_inicial = _total_coletas_gc()
+            self._tempos_iniciais = os.times()
+            _perfil_ativo = self
+
+        if self._amostrador is not None:
+            self._amostrador.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        global _perfil_ativo
+        if self._amostrador is not None:
+            self._amostrador.parar()
+
+        if self.habilitado:
+            _perfil_ativo = self._perfil_anterior
+            tempos_finais = os.times()
+            self._atualizar_pico_tracemalloc()
+            if self._perfil_anterior is not None:
+                self._perfil_anterior._incorporar_pico(self._pico_tracemalloc)
+            if self._iniciou_tracemalloc:
+                tracemalloc.stop()
+
+            self.metricas["Profiling"] = "tracemalloc"
+            self.metricas["Pico tracemalloc (MB)"] = _bytes_para_mb(self._pico_tracemalloc - self._memoria_inicial)
+            if self._amostrador.rss_inicial is not None:
+                self.metricas["Pico RSS da operação (MB)"] = _bytes_para_mb(self._amostrador.pico_rss)
+                self.metricas["Aumento de RSS na operação (MB)"] = _bytes_para_mb(self._amostrador.pico_rss - self._amostrador.rss_inicial)
+            self.metricas["CPU user (s)"] = round(tempos_finais.user - self._tempos_iniciais.user, 2)
+            self.metricas["CPU sys (s)"] = round(tempos_finais.system - self._tempos_iniciais.system, 2)
+            self.metricas["Coletas GC"] = _total_coletas_gc() - self._coletas_gc_inicial
+
+        if self._amostrador is not None and self._amostrador.coletar_pilhas:
+            self.metricas["Profiling"] = "flame graph"
+            try:
+                os.makedirs(self.diretorio_flame, exist_ok=True)
+                caminho = os.path.join(self.diretorio_flame, f"{_nome_arquivo(self.nome)}.folded")
+                self._amostrador.salvar(caminho)
+                print(f"Flame graph de '{self.nome}' gravado em '{caminho}'.")
+            except OSError as e:
+                print(f"Erro ao gravar flame graph de '{self.nome}': {e}")
+        return False
+
+    def _incorporar_pico(self, pico: int):
+        """
+        Incorpora um pico (em bytes) ao pico da operação e ao de cada etapa aberta.
+        """
+        self._pico_tracemalloc = max(self._pico_tracemalloc, pico)
+        self._picos_etapas = [max(pico_etapa, pico) for pico_etapa in self._picos_etapas]
+
+    def _atualizar_pico_tracemalloc(self):
+        """
+        Incorpora o pico atual do tracemalloc ao pico da operação e reinicia o contador,
+        permitindo medir o pico de cada etapa sem perder o pico da operação inteira.
+        """
+        self._incorporar_pico(tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+
+    @contextmanager
+    def etapa(self, nome_etapa: str):
+        """
+        Mede a duração e o pico do tracemalloc de uma etapa interna da operação.
+        """
+        self._atualizar_pico_tracemalloc()
+        memoria_inicial = tracemalloc.get_traced_memory()[0]
+        self._picos_etapas.append(memoria_inicial)
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            duracao = time.perf_counter() - inicio
+            self._atualizar_pico_tracemalloc()
+            pico_etapa = self._picos_etapas.pop()
+            self.etapas.append({
+                "Etapa": nome_etapa,
+                # Medida com o tracemalloc ativo: etapas com muitos objetos Python ficam mais lentas
+                # que etapas em C (executemany, numpy); compare durações reais em results.csv sem profiling.
+                "Duração com tracemalloc (s)": round(duracao, 6),
+                "Pico tracemalloc (MB)": _bytes_para_mb(pico_etapa - memoria_inicial),
+            })
+
+@contextmanager
+def medir_etapa(nome_etapa: str):
+    """
+    Mede uma etapa no perfil ativo, se houver. Sem perfil ativo não faz nada,
+    então pode ser usada nas funções de CRUD sem custo quando o perfil está desligado.
+    """
+    if _perfil_ativo is None:
+        yield
+        return
+    with _perfil_ativo.etapa(nome_etapa):
+        yield
@@ -2,7 +2,9 @@ import pandas as pd
 import datetime
 import os
 
-def log_results(test_type: str, rows_affected: int, duration_seconds: float, filename: str = "results.csv"):
+def log_results(test_type: str, rows_affected: int, duration_seconds: float, filename: str = "results.csv",
+                metricas: dict | None = None, etapas: list[dict] | None = None,
+                filename_etapas: str = "results_etapas.csv"):
     """
     Registra os resultados de um teste de inserção em um arquivo CSV.
 
@@ -11,6 +13,11 @@ def log_results(test_type: str, rows_affected: int, duration_seconds: float, fil
         rows_affected (int): Número de linhas que o teste tentou processar.
         duration_seconds (float): Duração total do teste em segundos.
         filename (str): Nome do arquivo CSV para logar os resultados.
+        metricas (dict | None): Métricas de recursos opcionais (ex: PerfilRecursos.metricas),
+            gravadas como colunas extras na mesma linha do tempo.
+        etapas (list[dict] | None): Métricas por etapa (ex: PerfilRecursos.etapas), gravadas
+            uma por linha em 'filename_etapas' para não alargar o CSV principal.
+        filename_etapas (str): Nome do arquivo CSV para as métricas por etapa.
     """
     
     df = pd.DataFrame(
@@ -18,17 +25,39 @@ def log_results(test_type: str, rows_affected: int, duration_seconds: float, fil
             {
                 "Tipo de processamento": test_type,
                 "Linhas Processadas": rows_affected,
-                "Duração em segundos": f"{duration_seconds:.2f}"
+                "Duração em segundos": f"{duration_seconds:.2f}",
+                **(metricas or {})
             }
         ]
     )
     
     # Verifica se o arquivo existe para decidir se inclui o cabeçalho
     file_exists = os.path.isfile(filename)
+    mode, header, destino = 'a', not file_exists, filename
 
     try:
-        df.to_csv(filename, mode='a', header=not file_exists, index=False)
+        if file_exists:
+            df_existente = pd.read_csv(filename, dtype=str)
+            if set(df.columns).issubset(df_existente.columns):
+                # Alinha ao cabeçalho existente para que todas as linhas tenham o mesmo número de campos
+                df = df.reindex(columns=df_existente.columns)
+            else:
+                # Colunas novas não cabem no cabeçalho existente: reescreve o arquivo com a união das colunas,
+                # primeiro num arquivo temporário para não perder o histórico se a escrita falhar
+                df = pd.concat([df_existente, df.astype(str)], ignore_index=True)
+                mode, header, destino = 'w', True, f"{filename}.tmp"
+        df.to_csv(destino, mode=mode, header=header, index=False)
+        if destino != filename:
+            os.replace(destino, filename)
         print(f"Log gerado em '{filename}': {test_type}, {rows_affected} linhas, {duration_seconds:.2f}s")
 
     except Exception as e:
         print(f"Erro ao gerar log para CSV '{filename}': {e}")
+
+    if etapas:
+        df_etapas = pd.DataFrame([{"Tipo de processamento": test_type, **etapa} for etapa in etapas])
+        try:
+            df_etapas.to_csv(filename_etapas, mode='a', header=not os.path.isfile(filename_etapas), index=False)
+            print(f"Log de {len(etapas)} etapas gerado em '{filename_etapas}': {test_type}")
+        except Exception as e:
+            print(f"Erro ao gerar log de etapas para CSV '{filename_etapas}': {e}")